@@ -1,5 +1,7 @@
 from pydantic import BaseModel
+from typing import Dict
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,6 +12,33 @@ class Settings(BaseModel):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
     DATABASE_URL: str = os.getenv("DATABASE_URL")
     MODEL_PATH: str = os.getenv("MODEL_PATH")
+    # Profil embarqué (DATABASE_URL=sqlite:///...) : pragmas et pools
+    # Cache de pages PAR CONNEXION (1 écrivain + jusqu'à 16+24 lecteurs) ; mmap est partagé
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", 8192))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", 16))
+    SQLITE_READ_MAX_OVERFLOW: int = int(os.getenv("SQLITE_READ_MAX_OVERFLOW", 24))
+    SQLITE_POOL_TIMEOUT: float = float(os.getenv("SQLITE_POOL_TIMEOUT", 30))
+    # "local" : modèle chargé dans chaque worker ; "server" : serveur d'inférence partagé
+    INFERENCE_MODE: str = os.getenv("INFERENCE_MODE", "local")
+    INFERENCE_ADDRESS: str = os.getenv("INFERENCE_ADDRESS", "127.0.0.1:8765")
+    INFERENCE_TIMEOUT: float = float(os.getenv("INFERENCE_TIMEOUT", 5))
+    INFERENCE_BATCH_WINDOW_MS: float = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", 2))
+    INFERENCE_MAX_BATCH: int = int(os.getenv("INFERENCE_MAX_BATCH", 64))
+    DRIFT_REFERENCE_PATH: str = os.getenv("DRIFT_REFERENCE_PATH", "ml/data/reference_distribution.json")
+
+    # Limitation de débit : budgets "N/second|minute|hour" par "METHODE /chemin"
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # "memory" ou "redis"
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    # Une valeur explicite (même "{}") remplace entièrement les budgets par défaut
+    RATE_LIMITS: Dict[str, str] = {
+        "POST /predict/": "60/minute",
+        "POST /auth/login": "10/minute",
+        "POST /auth/register": "10/minute",
+        "GET /admin/stats": "30/minute",
+    } if os.getenv("RATE_LIMITS") is None else json.loads(os.getenv("RATE_LIMITS"))
 
 settings = Settings()
 
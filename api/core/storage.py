@@ -0,0 +1,78 @@
+# core/storage.py
+import hashlib
+import json
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from ..ml.labels import CLASS_LABELS
+
+# Ordre fixe des champs de PredictionRequest
+PAYLOAD_FIELDS = (
+    "Gender", "Age", "Height", "Weight", "family_history_with_overweight",
+    "FAVC", "FCVC", "NCP", "CAEC", "SMOKE", "CH2O", "SCC", "FAF", "TUE",
+    "CALC", "MTRANS",
+)
+
+# Vocabulaires des champs catégoriels : valeurs du jeu d'entraînement, puis celles
+# du formulaire (templates/prediction.html). Ne jamais réordonner : ajouter en fin
+# de tuple, sinon les codes déjà stockés changeraient de sens.
+_YES_NO = ("no", "yes", "No", "Yes")
+_FREQUENCY = ("no", "Sometimes", "Frequently", "Always", "Never", "Yes", "No")
+CATEGORIES = {
+    "Gender": ("Female", "Male"),
+    "family_history_with_overweight": _YES_NO,
+    "FAVC": _YES_NO,
+    "CAEC": _FREQUENCY,
+    "SMOKE": _YES_NO,
+    "SCC": _YES_NO,
+    "CALC": _FREQUENCY,
+    "MTRANS": ("Public_Transportation", "Walking", "Automobile", "Motorbike", "Bike", "Car"),
+}
+_CODES = {field: {v: i for i, v in enumerate(values)} for field, values in CATEGORIES.items()}
+
+# Tableau de probabilités dans l'ordre fixe de CLASS_LABELS
+_PROBA_STRUCT = struct.Struct(f"<{len(CLASS_LABELS)}d")
+
+
+# Encodage compact du payload : liste ordonnée, catégories remplacées par leur code
+def encode_payload(data: dict) -> List:
+    """Encode un payload en liste compacte (les valeurs inconnues restent en clair)"""
+    encoded = []
+    for field in PAYLOAD_FIELDS:
+        value = data[field]
+        codes = _CODES.get(field)
+        if codes is not None and value in codes:
+            value = codes[value]
+        encoded.append(value)
+    return encoded
+
+def decode_payload(encoded: List) -> dict:
+    """Reconstruit le dict PredictionRequest à partir de la liste compacte"""
+    data = {}
+    for field, value in zip(PAYLOAD_FIELDS, encoded):
+        values = CATEGORIES.get(field)
+        if values is not None and isinstance(value, int):
+            value = values[value]
+        data[field] = value
+    return data
+
+def payload_digest(encoded: List) -> str:
+    """Empreinte de contenu (128 bits) utilisée pour dédupliquer les payloads"""
+    canonical = json.dumps(encoded, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+def pack_payload(data: dict) -> Tuple[str, List]:
+    encoded = encode_payload(data)
+    return payload_digest(encoded), encoded
+
+
+# Encodage des probabilités : tableau de float64 dans l'ordre de CLASS_LABELS
+def encode_proba(proba: Optional[Dict[str, float]]) -> Optional[bytes]:
+    if proba is None:
+        return None
+    return _PROBA_STRUCT.pack(*(proba.get(label, 0.0) for label in CLASS_LABELS))
+
+def decode_proba(blob: Optional[bytes]) -> Optional[Dict[str, float]]:
+    if blob is None:
+        return None
+    return dict(zip(CLASS_LABELS, _PROBA_STRUCT.unpack(blob)))
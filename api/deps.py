@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url, Insert, Update, Delete
 from sqlalchemy.orm import sessionmaker, Session
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -8,8 +8,68 @@ from .config import settings
 from .models import User
 
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# Pragmas du profil embarqué SQLite
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # Transactions gérées par SQLAlchemy (requis pour SAVEPOINT avec pysqlite)
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def check_sqlite_url(url: str):
+    """Le profil embarqué ouvre deux engines : ils doivent partager le même fichier"""
+    database = make_url(url).database
+    if not database or database == ":memory:" or "mode=memory" in url:
+        raise RuntimeError(
+            f"DATABASE_URL={url} : le profil SQLite requiert un fichier "
+            "(ex. sqlite:///./data/obesitrack.db), une base en mémoire n'est pas supportée"
+        )
+
+def _create_sqlite_engine(pool_size: int, max_overflow: int, begin: str):
+    sqlite_engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.SQLITE_POOL_TIMEOUT,
+    )
+    event.listen(sqlite_engine, "connect", _sqlite_pragmas)
+    event.listen(sqlite_engine, "begin", lambda conn: conn.exec_driver_sql(begin))
+    return sqlite_engine
+
+# Session SQLite : les écritures passent par l'unique connexion d'écriture
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        # Après une première écriture, toute la transaction reste sur l'écrivain :
+        # le pool de lecture ne verrait pas les lignes non encore commitées
+        if self.info.get("writer") or self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["writer"] = True
+            return engine
+        return read_engine
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writer", None)
+
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    check_sqlite_url(settings.DATABASE_URL)
+    # Un seul écrivain : le pool de taille 1 sert de file d'attente pour les INSERT
+    engine = _create_sqlite_engine(1, 0, "BEGIN IMMEDIATE")
+    # Lectures concurrentes (WAL) : assez de connexions pour le pool de threads d'uvicorn (40)
+    read_engine = _create_sqlite_engine(settings.SQLITE_READ_POOL_SIZE, settings.SQLITE_READ_MAX_OVERFLOW, "BEGIN")
+    SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+else:
+    engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+    read_engine = engine
+    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 security = HTTPBearer()
 
 # Dépendance pour obtenir une session de base de données
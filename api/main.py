@@ -10,6 +10,7 @@ from .deps import get_db, engine
 from .models import Base
 from .routes import auth, predictions, admin,web,admin_web
 from .core.templates import templates
+from .ratelimit import RateLimitMiddleware
 
 # App FastAPI
 app = FastAPI(
@@ -19,6 +20,10 @@ app = FastAPI(
 )
 
 
+# Limitation de débit par utilisateur / IP
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limits=settings.RATE_LIMITS)
+
 # Création des tables
 Base.metadata.create_all(bind=engine)
 
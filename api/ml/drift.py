@@ -0,0 +1,114 @@
+import json
+import math
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..config import settings
+
+# Plancher des proportions pour éviter log(0) dans le PSI
+_EPSILON = 1e-4
+# Seuils usuels du PSI
+_PSI_MODERATE = 0.1
+_PSI_SIGNIFICANT = 0.25
+
+
+# Histogramme en flux d'une feature, sur les bornes de la distribution de référence
+class FeatureHistogram:
+    def __init__(self, edges: list, proportions: list):
+        self.edges = edges
+        self.reference = proportions
+        self.counts = [0] * len(proportions)
+        self.total = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+
+    def update(self, value: float):
+        # inf / NaN fausseraient définitivement sum et sum_sq
+        if not math.isfinite(value):
+            return
+        self.counts[bisect_right(self.edges, value)] += 1
+        self.total += 1
+        self.sum += value
+        self.sum_sq += value * value
+
+    def report(self) -> dict:
+        if self.total == 0:
+            return {"count": 0, "psi": None, "ks": None, "mean": None, "status": "no_data"}
+        live = [c / self.total for c in self.counts]
+        psi = 0.0
+        ks = 0.0
+        cdf_live = cdf_ref = 0.0
+        for actual, expected in zip(live, self.reference):
+            a, e = max(actual, _EPSILON), max(expected, _EPSILON)
+            psi += (a - e) * math.log(a / e)
+            cdf_live += actual
+            cdf_ref += expected
+            ks = max(ks, abs(cdf_live - cdf_ref))
+        if psi >= _PSI_SIGNIFICANT:
+            status = "significant"
+        elif psi >= _PSI_MODERATE:
+            status = "moderate"
+        else:
+            status = "stable"
+        return {
+            "count": self.total,
+            "psi": psi,
+            "ks": ks,
+            "mean": self.sum / self.total,
+            "status": status,
+        }
+
+
+# Suivi de la dérive des entrées du modèle (état propre à chaque processus)
+class DriftMonitor:
+    def __init__(self, reference: dict):
+        self._lock = threading.Lock()
+        self.reference_size = reference["n_samples"]
+        self._means = {name: f["mean"] for name, f in reference["features"].items()}
+        self._histograms = {
+            name: FeatureHistogram(f["edges"], f["proportions"])
+            for name, f in reference["features"].items()
+        }
+
+    def update(self, features: Dict[str, float]):
+        with self._lock:
+            for name, histogram in self._histograms.items():
+                value = features.get(name)
+                if value is not None:
+                    histogram.update(float(value))
+
+    def report(self) -> dict:
+        with self._lock:
+            features = {}
+            for name, histogram in self._histograms.items():
+                features[name] = histogram.report()
+                features[name]["reference_mean"] = self._means[name]
+        return {"reference_size": self.reference_size, "features": features}
+
+
+_monitor: Optional[DriftMonitor] = None
+_monitor_lock = threading.Lock()
+# Référence absente : mémorisé pour ne pas reprendre le verrou ni relire le disque à chaque prédiction
+_MISSING = object()
+
+# Chargement paresseux de la distribution de référence produite par ml/train.py
+def get_drift_monitor() -> Optional[DriftMonitor]:
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                path = Path(settings.DRIFT_REFERENCE_PATH)
+                if path.exists():
+                    with open(path, "r") as f:
+                        _monitor = DriftMonitor(json.load(f))
+                else:
+                    print(f"Distribution de référence introuvable ({path}) : suivi de dérive désactivé")
+                    _monitor = _MISSING
+    return None if _monitor is _MISSING else _monitor
+
+def record_features(features: Dict[str, float]):
+    monitor = get_drift_monitor()
+    if monitor is not None:
+        monitor.update(features)
@@ -0,0 +1,212 @@
+"""
+Serveur d'inférence partagé avec micro-batching.
+
+Les workers de l'API envoient leurs vecteurs de features via un socket local
+(TCP ou Unix) ; un processus unique charge le modèle et regroupe les requêtes
+concurrentes en un seul appel vectorisé à predict_proba.
+
+Lancement : python -m api.ml.inference
+"""
+import asyncio
+import math
+import os
+import socket
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+
+# Colonnes attendues par le modèle (même ordre que preprocess_input)
+FEATURES = ("IMC", "Height", "Weight", "FCVC")
+
+# Protocole : requête = features en float64 ; réponse = (classe, nb classes) puis probabilités
+REQUEST = struct.Struct(f"<{len(FEATURES)}d")
+RESPONSE_HEADER = struct.Struct("<qq")
+_ERROR = -1
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """'unix:/chemin/socket' ou 'hote:port'"""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, port = address.rsplit(":", 1)
+    return socket.AF_INET, (host, int(port))
+
+
+# ==============================
+#  Client (workers de l'API)
+# ==============================
+_local = threading.local()
+
+def _connection() -> socket.socket:
+    sock = getattr(_local, "sock", None)
+    if sock is None:
+        family, address = parse_address(settings.INFERENCE_ADDRESS)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(settings.INFERENCE_TIMEOUT)
+        try:
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+        _local.sock = sock
+    return sock
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        n = sock.recv_into(view)
+        if n == 0:
+            raise ConnectionError("Connexion fermée par le serveur d'inférence")
+        view = view[n:]
+    return bytes(buffer)
+
+def _request(sock: socket.socket, features: Sequence[float]) -> Tuple[int, List[float]]:
+    sock.sendall(REQUEST.pack(*features))
+    pred, n_classes = RESPONSE_HEADER.unpack(_recv_exactly(sock, RESPONSE_HEADER.size))
+    proba = struct.unpack(f"<{n_classes}d", _recv_exactly(sock, 8 * n_classes))
+    return pred, list(proba)
+
+def remote_predict(features: Sequence[float]) -> Tuple[int, List[float]]:
+    """Envoie un vecteur au serveur d'inférence et retourne (classe, probabilités)"""
+    if not all(math.isfinite(v) for v in features):
+        raise ValueError("Features non finies : requête non envoyée au serveur d'inférence")
+    for attempt in range(2):
+        sock = _connection()
+        try:
+            pred, proba = _request(sock, features)
+            break
+        except ConnectionError:
+            # Connexion périmée (redémarrage du serveur) : on réessaie une fois
+            sock.close()
+            _local.sock = None
+            if attempt:
+                raise
+        except OSError:
+            # Délai dépassé : pas de renvoi, qui doublerait la charge d'un serveur saturé.
+            # La connexion est abandonnée car une réponse tardive la désynchroniserait.
+            sock.close()
+            _local.sock = None
+            raise
+    if pred == _ERROR:
+        raise RuntimeError("Erreur du serveur d'inférence")
+    return pred, proba
+
+
+# ==============================
+#  Serveur (processus dédié)
+# ==============================
+class MicroBatcher:
+    """Regroupe les requêtes arrivées pendant la fenêtre en un seul predict_proba"""
+
+    def __init__(self, model, window_ms: float, max_batch: int):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # Un seul thread : la boucle reste libre de lire les sockets pendant l'inférence
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def submit(self, features: Tuple[float, ...]) -> np.ndarray:
+        # Une ligne invalide ne doit pas entrer dans un lot partagé
+        if not all(math.isfinite(v) for v in features):
+            raise ValueError("Features non finies")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((features, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        items = [await self.queue.get()]
+        deadline = loop.time() + self.window
+        while len(items) < self.max_batch:
+            if not self.queue.empty():
+                items.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    def _predict_rows(self, X: pd.DataFrame) -> list:
+        """Repli ligne par ligne : chaque erreur reste attachée à sa requête"""
+        results = []
+        for i in range(len(X)):
+            try:
+                results.append(self.model.predict_proba(X.iloc[[i]])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            X = pd.DataFrame([features for features, _ in items], columns=FEATURES)
+            try:
+                results = list(await loop.run_in_executor(self.executor, self.model.predict_proba, X))
+            except Exception:
+                results = await loop.run_in_executor(self.executor, self._predict_rows, X)
+            for (_, future), result in zip(items, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+async def _handle_connection(batcher: MicroBatcher, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    classes = batcher.model.classes_
+    try:
+        while True:
+            data = await reader.readexactly(REQUEST.size)
+            try:
+                proba = await batcher.submit(REQUEST.unpack(data))
+                pred = int(classes[int(np.argmax(proba))])
+            except Exception as e:
+                print(f"Erreur d'inférence : {e}")
+                proba, pred = [], _ERROR
+            writer.write(RESPONSE_HEADER.pack(pred, len(proba)))
+            writer.write(struct.pack(f"<{len(proba)}d", *proba))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve():
+    from .ml_gradient import load_model
+
+    batcher = MicroBatcher(load_model(), settings.INFERENCE_BATCH_WINDOW_MS, settings.INFERENCE_MAX_BATCH)
+
+    async def handler(reader, writer):
+        await _handle_connection(batcher, reader, writer)
+
+    family, address = parse_address(settings.INFERENCE_ADDRESS)
+    if family == socket.AF_UNIX:
+        if os.path.exists(address):
+            os.remove(address)
+        server = await asyncio.start_unix_server(handler, path=address)
+    else:
+        server = await asyncio.start_server(handler, *address)
+    print(f"Serveur d'inférence à l'écoute sur {settings.INFERENCE_ADDRESS}")
+    async with server:
+        await asyncio.gather(server.serve_forever(), batcher.run())
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
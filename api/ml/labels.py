@@ -0,0 +1,10 @@
+# Classes du modèle, dans l'ordre des indices produits par ml/train.py
+CLASS_LABELS = (
+    "Insufficient_Weight",
+    "Normal_Weight",
+    "Overweight_Level_I",
+    "Overweight_Level_II",
+    "Obesity_Type_I",
+    "Obesity_Type_II",
+    "Obesity_Type_III",
+)
@@ -2,17 +2,12 @@ import joblib
 import pandas as pd
 from typing import Dict, Tuple, Optional
 from ..config import settings
+from .labels import CLASS_LABELS
+from .drift import record_features
+from .inference import remote_predict
 
 _model = None
-_label_map = {
-    0: "Insufficient_Weight",
-    1: "Normal_Weight",
-    2: "Overweight_Level_I",
-    3: "Overweight_Level_II",
-    4: "Obesity_Type_I",
-    5: "Obesity_Type_II",
-    6: "Obesity_Type_III"
-}
+_label_map = dict(enumerate(CLASS_LABELS))
 
 # Chargement du modèle ML
 def load_model():
@@ -36,11 +31,20 @@ def preprocess_input(data: dict) -> pd.DataFrame:
 
 # Prédiction
 def predict_obesity(payload: dict) -> Tuple[str, Optional[Dict[str, float]]]:
-    model = load_model()
     X = preprocess_input(payload)
+    features = X.iloc[0].to_dict()
+    if settings.INFERENCE_MODE == "server":
+        pred, proba_array = remote_predict(X.iloc[0].tolist())
+        probabilities = { _label_map[i]: float(p) for i, p in enumerate(proba_array) }
+        # La dérive reste suivie par worker : /admin/drift ne voit que le trafic de ce processus
+        record_features(features)
+        return _label_map[pred], probabilities
+    model = load_model()
     pred = model.predict(X)[0]
     probabilities = None
     if hasattr(model, "predict_proba"):
         proba_array = model.predict_proba(X)[0]
         probabilities = { _label_map[i]: float(p) for i, p in enumerate(proba_array) }
+    # Uniquement les entrées que le modèle a acceptées
+    record_features(features)
     return _label_map[pred], probabilities
@@ -1,8 +1,10 @@
 from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped, relationship
-from sqlalchemy import String, Text, JSON, ForeignKey, func,DateTime
+from sqlalchemy import String, Text, JSON, ForeignKey, func,DateTime, LargeBinary, Index
 import uuid
 from datetime import datetime
 
+from .core.storage import decode_payload, decode_proba
+
 # Base de données
 class Base(DeclarativeBase):
     pass
@@ -23,14 +25,32 @@ class User(Base):
 
     predictions: Mapped[list["Prediction"]] = relationship(back_populates="user")
 
+# Payload dédupliqué, adressé par son empreinte de contenu
+class PredictionPayload(Base):
+    __tablename__ = "prediction_payloads"
+    digest: Mapped[str] = mapped_column(String(32), primary_key=True)
+    data: Mapped[list] = mapped_column(JSON)
+
 # Classe Prediction
 class Prediction(Base):
     __tablename__ = "predictions"
+    # Historique par utilisateur trié par date (identique PostgreSQL / SQLite)
+    __table_args__ = (Index("ix_predictions_user_created", "user_id", "created_at"),)
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uuid4_str)
     user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"))
-    payload_json: Mapped[dict] = mapped_column(JSON)
+    payload_digest: Mapped[str] = mapped_column(String(32), ForeignKey("prediction_payloads.digest"))
     predicted_class: Mapped[str] = mapped_column(String(100))
-    proba: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    proba_blob: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    user: Mapped[User] = relationship(back_populates="predictions")
\ No newline at end of file
+    user: Mapped[User] = relationship(back_populates="predictions")
+    payload: Mapped[PredictionPayload] = relationship()
+
+    # Vues décodées : même forme JSON qu'avant pour l'API
+    @property
+    def payload_json(self) -> dict:
+        return decode_payload(self.payload.data)
+
+    @property
+    def proba(self) -> dict | None:
+        return decode_proba(self.proba_blob)
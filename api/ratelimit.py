@@ -0,0 +1,134 @@
+# api/ratelimit.py
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+import jwt
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from .config import settings
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+# Limitation de débit : token bucket par (route, utilisateur ou IP)
+
+def parse_limit(limit: str) -> Tuple[float, float]:
+    """'10/minute' -> (capacité, jetons par seconde)"""
+    count, period = limit.split("/")
+    capacity = float(count)
+    return capacity, capacity / _PERIODS[period.strip()]
+
+
+class MemoryBackend:
+    """Buckets en mémoire, propres à chaque processus"""
+
+    def __init__(self, sweep_every: int = 10000):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    async def acquire(self, key: str, capacity: float, rate: float) -> float:
+        """Consomme un jeton ; retourne 0 si accepté, sinon le délai d'attente en secondes"""
+        # Aucun await : la mise à jour est atomique dans la boucle d'événements
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            wait = 0.0
+        else:
+            self._buckets[key] = (tokens, now)
+            wait = (1 - tokens) / rate
+        self._calls += 1
+        if self._calls % self._sweep_every == 0:
+            self._sweep(now)
+        return wait
+
+    def _sweep(self, now: float):
+        # Un bucket inactif depuis une heure est forcément plein : inutile de le garder
+        stale = [key for key, (_, last) in self._buckets.items() if now - last > 3600]
+        for key in stale:
+            del self._buckets[key]
+
+
+class RedisBackend:
+    """Buckets partagés entre processus et machines (nécessite le paquet redis)"""
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'last')
+    local tokens = tonumber(state[1]) or capacity
+    local last = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'last', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiert le paquet 'redis' (pip install redis)")
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    async def acquire(self, key: str, capacity: float, rate: float) -> float:
+        wait = await self._script(keys=[f"ratelimit:{key}"], args=[capacity, rate, time.time()])
+        return float(wait)
+
+
+def create_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryBackend()
+
+
+def client_identity(request) -> str:
+    """Sujet du JWT si le token est valide, sinon l'adresse IP"""
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        try:
+            payload = jwt.decode(auth[7:], settings.SECRET_KEY, algorithms=["HS256"])
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except jwt.PyJWTError:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Rejette en 429 les requêtes au-delà du budget de la route, avant tout accès DB"""
+
+    def __init__(self, app, limits: Dict[str, str], backend=None):
+        super().__init__(app)
+        self.limits = {route: parse_limit(limit) for route, limit in limits.items()}
+        self.backend = backend or create_backend()
+
+    def _limit_for(self, request) -> Optional[Tuple[str, Tuple[float, float]]]:
+        route = f"{request.method} {request.url.path}"
+        limit = self.limits.get(route)
+        return (route, limit) if limit else None
+
+    async def dispatch(self, request, call_next):
+        match = self._limit_for(request)
+        if match is not None:
+            route, (capacity, rate) = match
+            wait = await self.backend.acquire(f"{route}:{client_identity(request)}", capacity, rate)
+            if wait > 0:
+                return JSONResponse(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    content={"detail": "Too many requests"},
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+        return await call_next(request)
@@ -1,17 +1,30 @@
 # api/routes/admin_api.py
 from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from typing import List, Dict
 from datetime import datetime, timedelta
 
-from ..models import User, Prediction
-from ..schemas import UserInfo, AdminStats, UserCreate,UserUpdate
+from ..models import User, Prediction, PredictionPayload
+from ..schemas import UserInfo, AdminStats, UserCreate,UserUpdate, DriftReport
 from ..deps import get_db, get_current_user
 from ..security import hash_password
+from ..ml.drift import get_drift_monitor
 
 router = APIRouter(prefix="/admin", tags=["admin-api"])
 
+# Supprime les payloads qui ne sont plus référencés par aucune prédiction
+def delete_orphan_payloads(db: Session, digests: set):
+    if not digests:
+        return
+    # Verrou sur les candidats : une prédiction concurrente qui les réutilise
+    # (store_payload) attend notre commit, ou nous attendons le sien
+    db.query(PredictionPayload.digest).filter(PredictionPayload.digest.in_(digests)).with_for_update().all()
+    still_used = db.query(Prediction.payload_digest).filter(Prediction.payload_digest.in_(digests))
+    db.query(PredictionPayload)\
+        .filter(PredictionPayload.digest.in_(digests), PredictionPayload.digest.not_in(still_used))\
+        .delete(synchronize_session=False)
+
 def verify_admin(current_user: User = Depends(get_current_user)):
     if current_user.role != 'admin':
         raise HTTPException(
@@ -59,6 +72,16 @@ def get_admin_stats(admin_user: User = Depends(verify_admin), db: Session = Depe
         recent_users=recent_users or 0
     )
 
+@router.get("/drift", response_model=DriftReport)
+def get_drift_report(admin_user: User = Depends(verify_admin)):
+    """
+    Dérive des entrées du modèle (PSI / KS) par rapport à la distribution d'entraînement
+    """
+    monitor = get_drift_monitor()
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Distribution de référence non trouvée")
+    return monitor.report()
+
 @router.get("/users/{user_id}/predictions")
 def get_user_predictions_admin(user_id: str, limit: int = 50,
                                admin_user: User = Depends(verify_admin),
@@ -68,6 +91,7 @@ def get_user_predictions_admin(user_id: str, limit: int = 50,
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     
     predictions = db.query(Prediction)\
+        .options(joinedload(Prediction.payload))\
         .filter(Prediction.user_id == user_id)\
         .order_by(Prediction.created_at.desc())\
         .limit(limit).all()
@@ -95,7 +119,9 @@ def delete_user(user_id: str, admin_user: User = Depends(verify_admin), db: Sess
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     
+    digests = {d for (d,) in db.query(Prediction.payload_digest).filter(Prediction.user_id == user_id).distinct()}
     db.query(Prediction).filter(Prediction.user_id == user_id).delete()
+    delete_orphan_payloads(db, digests)
     db.delete(user)
     db.commit()
     
@@ -163,6 +189,7 @@ def get_user_predictions_admin(user_id: str, limit: int = 50,
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
     
     predictions = db.query(Prediction)\
+        .options(joinedload(Prediction.payload))\
         .filter(Prediction.user_id == user_id)\
         .order_by(Prediction.created_at.desc())\
         .limit(limit).all()
@@ -198,6 +225,8 @@ def delete_prediction(
         raise HTTPException(status_code=404, detail="Prédiction non trouvée")
     
     db.delete(prediction)
+    db.flush()
+    delete_orphan_payloads(db, {prediction.payload_digest})
     db.commit()
     
     return {"message": f"Prédiction {prediction_id} supprimée avec succès"}
\ No newline at end of file
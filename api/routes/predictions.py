@@ -1,20 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
 
 from ..schemas import PredictionRequest, PredictionResponse
-from ..models import User, Prediction
+from ..models import User, Prediction, PredictionPayload
 from ..deps import get_db, get_current_user
 from ..ml.ml_gradient import predict_obesity
+from ..core.storage import pack_payload, encode_proba
 from ..core.templates import templates
 
 router = APIRouter(prefix="/predict", tags=["predictions"])
 
+_UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Insère le payload s'il n'existe pas, dans la transaction de la prédiction.
+# Le DO UPDATE (sans effet) verrouille la ligne existante jusqu'au commit :
+# delete_orphan_payloads ne peut pas la supprimer avant que la prédiction la référence.
+def store_payload(db: Session, input_data: dict) -> str:
+    digest, encoded = pack_payload(input_data)
+    stmt = _UPSERT[db.get_bind().dialect.name](PredictionPayload).values(digest=digest, data=encoded)
+    db.execute(stmt.on_conflict_do_update(index_elements=["digest"], set_={"digest": stmt.excluded.digest}))
+    return digest
+
 # Envoie le formulaire de prediction
 @router.post("/", response_model=PredictionResponse)
 def make_prediction(prediction_request: PredictionRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     input_data = prediction_request.model_dump()
     predicted_class, probabilities = predict_obesity(input_data)
-    record = Prediction(user_id=current_user.id, payload_json=input_data, predicted_class=predicted_class, proba=probabilities)
+    digest = store_payload(db, input_data)
+    record = Prediction(user_id=current_user.id, payload_digest=digest, predicted_class=predicted_class, proba_blob=encode_proba(probabilities))
     db.add(record)
     db.commit()
     db.refresh(record)
@@ -30,11 +30,11 @@ class UserInfo(BaseModel):
 class PredictionRequest(BaseModel):
     Gender: str
     Age: float
-    Height: float
-    Weight: float
+    Height: float = Field(gt=0, allow_inf_nan=False)
+    Weight: float = Field(gt=0, allow_inf_nan=False)
     family_history_with_overweight: str
     FAVC: str
-    FCVC: float
+    FCVC: float = Field(allow_inf_nan=False)
     NCP: float
     CAEC: str
     SMOKE: str
@@ -56,4 +56,18 @@ class AdminStats(BaseModel):
     total_users: int
     total_predictions: int
     predictions_by_class: Dict[str, int]
-    recent_users: int  # derniers 7 jours
\ No newline at end of file
+    recent_users: int  # derniers 7 jours
+
+
+class FeatureDrift(BaseModel):
+    count: int
+    psi: float | None
+    ks: float | None
+    mean: float | None
+    reference_mean: float
+    status: str  # "stable", "moderate", "significant" ou "no_data"
+
+
+class DriftReport(BaseModel):
+    reference_size: int
+    features: Dict[str, FeatureDrift]
\ No newline at end of file
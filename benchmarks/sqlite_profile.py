@@ -0,0 +1,111 @@
+"""
+Débit soutenu des prédictions sur le profil embarqué SQLite.
+
+Des threads appellent la route make_prediction (inférence + INSERT) pendant
+que d'autres lisent l'historique, comme le ferait le pool de threads d'uvicorn.
+
+Usage :
+    DATABASE_URL=sqlite:///./bench.db MODEL_PATH=ml/data/gradient_boosting_model.pkl \\
+        python -m benchmarks.sqlite_profile --writers 16 --readers 2 --duration 20
+"""
+import argparse
+import random
+import threading
+import time
+
+from api.config import settings
+from api.deps import SessionLocal, engine
+from api.models import Base, User, Prediction
+from api.routes.predictions import make_prediction
+from api.schemas import PredictionRequest
+
+
+def random_request(rng: random.Random) -> PredictionRequest:
+    # Moitié au format du formulaire web (Yes/No, Never, Car), moitié au format du CSV
+    form = rng.random() < 0.5
+    yes, no = ("Yes", "No") if form else ("yes", "no")
+    height = round(rng.uniform(1.45, 1.98), 2)
+    return PredictionRequest(
+        Gender=rng.choice(["Female", "Male"]),
+        Age=float(rng.randint(14, 61)),
+        Height=height,
+        Weight=float(rng.randint(40, 170)),
+        family_history_with_overweight=rng.choice([yes, no]),
+        FAVC=rng.choice([yes, no]),
+        FCVC=float(rng.randint(1, 3)),
+        NCP=float(rng.randint(1, 4)),
+        CAEC=rng.choice(["Never" if form else "no", "Sometimes", "Frequently", "Always"]),
+        SMOKE=no,
+        CH2O=float(rng.randint(1, 3)),
+        SCC=no,
+        FAF=float(rng.randint(0, 3)),
+        TUE=float(rng.randint(0, 2)),
+        CALC=rng.choice([yes, no] if form else ["no", "Sometimes", "Frequently"]),
+        MTRANS=rng.choice(["Public_Transportation", "Walking", "Car" if form else "Automobile"]),
+    )
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--distinct-payloads", type=int, default=200)
+    args = parser.parse_args()
+
+    if not settings.DATABASE_URL.startswith("sqlite"):
+        raise SystemExit("DATABASE_URL doit pointer vers une base SQLite")
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = User(email=f"bench-{time.time_ns()}@obesitrack.local", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    rng = random.Random(42)
+    requests = [random_request(rng) for _ in range(args.distinct_payloads)]
+    stop = threading.Event()
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def writer(seed: int):
+        local_rng = random.Random(seed)
+        while not stop.is_set():
+            with SessionLocal() as db:
+                current_user = db.get(User, user_id)
+                try:
+                    make_prediction(local_rng.choice(requests), current_user, db)
+                    key = "writes"
+                except Exception as e:
+                    print(f"Erreur : {e}")
+                    key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def reader():
+        while not stop.is_set():
+            with SessionLocal() as db:
+                db.query(Prediction).filter(Prediction.user_id == user_id)\
+                    .order_by(Prediction.created_at.desc()).limit(50).all()
+            with lock:
+                counts["reads"] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"Durée : {elapsed:.1f} s ({args.writers} écrivains, {args.readers} lecteurs)")
+    print(f"Prédictions enregistrées : {counts['writes']} ({counts['writes'] / elapsed:.0f}/s)")
+    print(f"Lectures d'historique : {counts['reads']} ({counts['reads'] / elapsed:.0f}/s)")
+    print(f"Erreurs : {counts['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Migration vers le stockage compact des prédictions.
+
+Crée prediction_payloads, remplit payload_digest / proba_blob à partir des
+anciennes colonnes JSON payload_json / proba, puis supprime ces colonnes.
+Le tout s'exécute dans une seule transaction ; relancer le script sur une
+base déjà migrée ne fait rien.
+
+Usage :
+    python -m migrations.compact_prediction_storage
+"""
+import json
+
+from sqlalchemy import inspect, text, LargeBinary
+
+from api.core.storage import pack_payload, encode_proba
+from api.deps import engine
+from api.models import Prediction, PredictionPayload
+
+BATCH_SIZE = 1000
+
+
+def _load(value):
+    # JSON décodé par psycopg2, chaîne brute avec SQLite
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def migrate():
+    columns = {c["name"] for c in inspect(engine).get_columns("predictions")}
+    if "payload_json" not in columns:
+        print("Base déjà migrée.")
+        return
+
+    postgres = engine.dialect.name == "postgresql"
+    blob_type = LargeBinary().compile(dialect=engine.dialect)
+
+    with engine.begin() as conn:
+        PredictionPayload.__table__.create(conn, checkfirst=True)
+        if "payload_digest" not in columns:
+            conn.execute(text("ALTER TABLE predictions ADD COLUMN payload_digest VARCHAR(32)"))
+        if "proba_blob" not in columns:
+            conn.execute(text(f"ALTER TABLE predictions ADD COLUMN proba_blob {blob_type}"))
+
+        known = {d for (d,) in conn.execute(text("SELECT digest FROM prediction_payloads"))}
+        migrated = 0
+        last_id = ""
+        while True:
+            rows = conn.execute(
+                text("SELECT id, payload_json, proba FROM predictions WHERE id > :last ORDER BY id LIMIT :n"),
+                {"last": last_id, "n": BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            new_payloads = []
+            updates = []
+            for row_id, payload_json, proba in rows:
+                digest, encoded = pack_payload(_load(payload_json))
+                if digest not in known:
+                    known.add(digest)
+                    new_payloads.append({"digest": digest, "data": encoded})
+                updates.append({"id": row_id, "digest": digest, "blob": encode_proba(_load(proba))})
+            if new_payloads:
+                conn.execute(PredictionPayload.__table__.insert(), new_payloads)
+            conn.execute(
+                text("UPDATE predictions SET payload_digest = :digest, proba_blob = :blob WHERE id = :id"),
+                updates,
+            )
+            migrated += len(rows)
+            last_id = rows[-1][0]
+
+        conn.execute(text("ALTER TABLE predictions DROP COLUMN payload_json"))
+        conn.execute(text("ALTER TABLE predictions DROP COLUMN proba"))
+        if postgres:
+            # SQLite ne permet pas d'ajouter ces contraintes par ALTER TABLE
+            conn.execute(text("ALTER TABLE predictions ALTER COLUMN payload_digest SET NOT NULL"))
+            conn.execute(text(
+                "ALTER TABLE predictions ADD CONSTRAINT predictions_payload_digest_fkey "
+                "FOREIGN KEY (payload_digest) REFERENCES prediction_payloads (digest)"
+            ))
+        for index in Prediction.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+    print(f"{migrated} prédictions migrées, {len(known)} payloads distincts.")
+
+
+if __name__ == "__main__":
+    migrate()
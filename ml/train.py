@@ -23,6 +23,22 @@ def preprocess(df: pd.DataFrame) -> pd.DataFrame:
     columns_select = ["IMC", "Height", "Weight", "FCVC", "NObeyesdad_num"]
     return data[columns_select]
 
+# Distribution de référence des features (histogrammes par quantiles)
+def reference_distribution(X: pd.DataFrame, n_bins: int = 10) -> dict:
+    features = {}
+    for col in X.columns:
+        values = X[col].to_numpy(dtype=float)
+        quantiles = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])
+        edges = np.unique(quantiles)
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        features[col] = {
+            "edges": edges.tolist(),
+            "proportions": (counts / len(values)).tolist(),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+        }
+    return {"n_samples": len(X), "features": features}
+
 # Entraînement et sauvegarde du modèle
 def best_model(df):
     pipeline=Pipeline([
@@ -66,6 +82,9 @@ def best_model(df):
             "classes": len(np.unique(y))
         }, f, indent=2)
 
+    with open("ml/data/reference_distribution.json", "w") as f:
+        json.dump(reference_distribution(X_train), f, indent=2)
+
     with open("ml/data/label_map.json", "w") as f:
         json.dump({v: k for k, v in LABEL_MAP.items()}, f)
 
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Base SQLite jetable : api.deps crée les engines dès l'import
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("MODEL_PATH", "ml/data/gradient_boosting_model.pkl")
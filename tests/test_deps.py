@@ -0,0 +1,27 @@
+import pytest
+
+from api.deps import SessionLocal, check_sqlite_url, engine, read_engine
+from api.models import Base, User
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///:memory:", "sqlite:///file:db?mode=memory&uri=true"])
+def test_in_memory_sqlite_is_rejected(url):
+    with pytest.raises(RuntimeError):
+        check_sqlite_url(url)
+
+
+def test_file_sqlite_is_accepted():
+    check_sqlite_url("sqlite:///./data/obesitrack.db")
+
+
+def test_session_reads_its_own_writes():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add(User(email="own-writes@example.com", hashed_password="x"))
+        db.flush()
+        found = db.query(User).filter(User.email == "own-writes@example.com").first()
+        assert found is not None
+        assert db.get_bind(clause=None) is engine
+        db.rollback()
+        assert db.get_bind(clause=None) is read_engine
+        assert db.query(User).filter(User.email == "own-writes@example.com").first() is None
@@ -0,0 +1,57 @@
+import pytest
+from pydantic import ValidationError
+
+from api.ml import drift
+from api.ml.drift import DriftMonitor
+from api.schemas import PredictionRequest
+
+REFERENCE = {
+    "n_samples": 4,
+    "features": {"Height": {"edges": [1.6, 1.7], "proportions": [0.25, 0.5, 0.25], "mean": 1.65, "std": 0.1}},
+}
+
+
+def test_non_finite_values_are_ignored():
+    monitor = DriftMonitor(REFERENCE)
+    for value in (1.65, float("inf"), float("nan"), 1.75):
+        monitor.update({"Height": value})
+    report = monitor.report()["features"]["Height"]
+    assert report["count"] == 2
+    assert report["mean"] == 1.7
+
+
+def test_matching_distribution_is_stable():
+    monitor = DriftMonitor(REFERENCE)
+    for value in (1.5, 1.65, 1.65, 1.8):
+        monitor.update({"Height": value})
+    report = monitor.report()["features"]["Height"]
+    assert report["psi"] < 1e-9
+    assert report["status"] == "stable"
+
+
+def test_missing_reference_is_checked_once(monkeypatch, tmp_path):
+    checks = []
+    original_exists = drift.Path.exists
+
+    def counting_exists(self):
+        checks.append(self)
+        return original_exists(self)
+
+    monkeypatch.setattr(drift, "_monitor", None)
+    monkeypatch.setattr(drift.settings, "DRIFT_REFERENCE_PATH", str(tmp_path / "absent.json"))
+    monkeypatch.setattr(drift.Path, "exists", counting_exists)
+
+    for _ in range(3):
+        drift.record_features({"Height": 1.7})
+    assert drift.get_drift_monitor() is None
+    assert len(checks) == 1
+
+
+def test_fcvc_rejects_nan():
+    payload = dict(
+        Gender="Female", Age=21.0, Height=1.62, Weight=64.0, family_history_with_overweight="yes",
+        FAVC="no", FCVC=float("nan"), NCP=3.0, CAEC="no", SMOKE="no", CH2O=2.0, SCC="no",
+        FAF=0.0, TUE=1.0, CALC="no", MTRANS="Walking",
+    )
+    with pytest.raises(ValidationError):
+        PredictionRequest(**payload)
@@ -0,0 +1,69 @@
+import asyncio
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from api.ml import inference
+from api.ml.inference import MicroBatcher, remote_predict
+
+
+class RejectsNegativeHeight:
+    classes_ = np.arange(2)
+
+    def predict_proba(self, X):
+        if (X["Height"] < 0).any():
+            raise ValueError("Height invalide")
+        return np.tile([0.25, 0.75], (len(X), 1))
+
+
+def test_failing_row_does_not_fail_the_batch():
+    async def scenario():
+        batcher = MicroBatcher(RejectsNegativeHeight(), window_ms=20, max_batch=64)
+        task = asyncio.create_task(batcher.run())
+        good = (24.4, 1.62, 64.0, 2.0)
+        results = await asyncio.gather(
+            batcher.submit(good),
+            batcher.submit((24.4, -1.0, 64.0, 2.0)),
+            batcher.submit(good),
+            return_exceptions=True,
+        )
+        task.cancel()
+        return results
+
+    first, bad, second = asyncio.run(scenario())
+    assert list(first) == [0.25, 0.75]
+    assert isinstance(bad, ValueError)
+    assert list(second) == [0.25, 0.75]
+
+
+def test_non_finite_vectors_are_rejected_before_sending():
+    with pytest.raises(ValueError):
+        remote_predict((float("inf"), 1.62, 64.0, 2.0))
+
+
+def test_timeout_is_not_retried(monkeypatch):
+    # Serveur qui lit la requête sans jamais répondre
+    server = socket.create_server(("127.0.0.1", 0))
+    connections = []
+
+    def accept():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            connections.append(conn)
+            conn.recv(inference.REQUEST.size)
+
+    threading.Thread(target=accept, daemon=True).start()
+    host, port = server.getsockname()
+    monkeypatch.setattr(inference.settings, "INFERENCE_ADDRESS", f"{host}:{port}")
+    monkeypatch.setattr(inference.settings, "INFERENCE_TIMEOUT", 0.2)
+    monkeypatch.setattr(inference, "_local", threading.local())
+
+    with pytest.raises(socket.timeout):
+        remote_predict((24.4, 1.62, 64.0, 2.0))
+    assert len(connections) == 1
+    server.close()
@@ -0,0 +1,107 @@
+import pytest
+
+from api.core.storage import (
+    CATEGORIES, CLASS_LABELS, PAYLOAD_FIELDS, decode_payload, decode_proba, encode_payload, encode_proba, pack_payload,
+)
+from api.deps import SessionLocal, engine
+from api.models import Base, Prediction, PredictionPayload, User
+from api.routes import predictions
+from api.schemas import PredictionRequest
+
+PAYLOAD = {
+    "Gender": "Female", "Age": 21.0, "Height": 1.62, "Weight": 64.0,
+    "family_history_with_overweight": "yes", "FAVC": "no", "FCVC": 2.0, "NCP": 3.0,
+    "CAEC": "Sometimes", "SMOKE": "no", "CH2O": 2.0, "SCC": "no", "FAF": 0.0,
+    "TUE": 1.0, "CALC": "no", "MTRANS": "Public_Transportation",
+}
+PROBA = {label: i / 21 for i, label in enumerate(CLASS_LABELS)}
+
+
+def test_payload_round_trip_with_known_codes():
+    encoded = encode_payload(PAYLOAD)
+    assert encoded[0] == 0  # Gender=Female
+    assert encoded[8] == 1  # CAEC=Sometimes
+    assert decode_payload(encoded) == PAYLOAD
+
+
+def test_form_payload_is_fully_interned():
+    # Valeurs envoyées par templates/prediction.html
+    form = dict(
+        PAYLOAD, family_history_with_overweight="Yes", FAVC="No", CAEC="Never",
+        SMOKE="No", SCC="No", CALC="Yes", MTRANS="Car",
+    )
+    encoded = encode_payload(form)
+    categorical = [encoded[i] for i, field in enumerate(PAYLOAD_FIELDS) if field in CATEGORIES]
+    assert all(isinstance(code, int) for code in categorical)
+    assert decode_payload(encoded) == form
+
+
+def test_payload_round_trip_keeps_unknown_strings():
+    data = dict(PAYLOAD, Gender="Other", MTRANS="Scooter")
+    encoded = encode_payload(data)
+    assert encoded[0] == "Other"
+    assert encoded[-1] == "Scooter"
+    assert decode_payload(encoded) == data
+
+
+def test_payload_digest_is_stable():
+    digest, _ = pack_payload(PAYLOAD)
+    assert pack_payload(dict(PAYLOAD))[0] == digest
+    assert len(digest) == 32
+    assert pack_payload(dict(PAYLOAD, Age=22.0))[0] != digest
+
+
+def test_proba_round_trip():
+    blob = encode_proba(PROBA)
+    assert len(blob) == 8 * len(CLASS_LABELS)
+    assert decode_proba(blob) == PROBA
+    assert list(decode_proba(blob)) == list(CLASS_LABELS)
+    assert encode_proba(None) is None
+    assert decode_proba(None) is None
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_identical_submissions_share_one_payload(db, monkeypatch):
+    monkeypatch.setattr(predictions, "predict_obesity", lambda payload: ("Normal_Weight", PROBA))
+    user = User(email="dedup@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    first = predictions.make_prediction(PredictionRequest(**PAYLOAD), user, db)
+    second = predictions.make_prediction(PredictionRequest(**PAYLOAD), user, db)
+
+    assert first.id != second.id
+    assert db.query(Prediction).count() == 2
+    assert db.query(PredictionPayload).count() == 1
+    stored = db.get(Prediction, first.id)
+    assert stored.payload_json == PAYLOAD
+    assert stored.proba == PROBA
+
+
+def test_payload_deleted_as_orphan_is_recreated_by_pending_prediction(db, monkeypatch):
+    from api.routes.admin import delete_orphan_payloads
+
+    monkeypatch.setattr(predictions, "predict_obesity", lambda payload: ("Normal_Weight", PROBA))
+    user = User(email="race@example.com", hashed_password="x")
+    digest, encoded = pack_payload(PAYLOAD)
+    db.add_all([user, PredictionPayload(digest=digest, data=encoded)])
+    db.commit()
+
+    # La prédiction a commencé (lecture de l'utilisateur) quand l'admin purge le payload orphelin
+    with SessionLocal() as pending:
+        current_user = pending.get(User, user.id)
+        with SessionLocal() as admin:
+            delete_orphan_payloads(admin, {digest})
+            admin.commit()
+        response = predictions.make_prediction(PredictionRequest(**PAYLOAD), current_user, pending)
+
+    with SessionLocal() as check:
+        assert check.get(Prediction, response.id).payload_json == PAYLOAD
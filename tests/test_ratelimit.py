@@ -0,0 +1,84 @@
+import asyncio
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.config
+from api import ratelimit
+from api.config import settings
+from api.ratelimit import MemoryBackend, parse_limit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock)
+    return clock
+
+
+def test_parse_limit():
+    assert parse_limit("10/minute") == (10.0, 10 / 60)
+    assert parse_limit("5/second") == (5.0, 5.0)
+    assert parse_limit("3600 / hour") == (3600.0, 1.0)
+    with pytest.raises(KeyError):
+        parse_limit("10/day")
+
+
+def test_bucket_empties_then_refills(clock):
+    backend = MemoryBackend()
+    capacity, rate = parse_limit("2/minute")  # un jeton toutes les 30 s
+
+    def acquire():
+        return asyncio.run(backend.acquire("k", capacity, rate))
+
+    assert acquire() == 0
+    assert acquire() == 0
+    assert acquire() == pytest.approx(30.0)
+
+    clock.now += 10
+    assert acquire() == pytest.approx(20.0)
+
+    clock.now += 20
+    assert acquire() == 0
+
+
+def test_buckets_are_independent_per_key(clock):
+    backend = MemoryBackend()
+    assert asyncio.run(backend.acquire("a", 1, 1)) == 0
+    assert asyncio.run(backend.acquire("a", 1, 1)) > 0
+    assert asyncio.run(backend.acquire("b", 1, 1)) == 0
+
+
+def test_login_is_rejected_after_budget():
+    from api.deps import engine
+    from api.main import app
+    from api.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    capacity, _ = parse_limit(settings.RATE_LIMITS["POST /auth/login"])
+    client = TestClient(app)
+    form = {"username": "nobody@example.com", "password": "wrong-password"}
+
+    statuses = [client.post("/auth/login", data=form).status_code for _ in range(int(capacity) + 1)]
+
+    assert statuses[:-1] == [401] * int(capacity)
+    assert statuses[-1] == 429
+    response = client.post("/auth/login", data=form)
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_explicit_empty_rate_limits_are_respected(monkeypatch):
+    # Les valeurs par défaut de Settings sont lues à l'import du module
+    monkeypatch.setenv("RATE_LIMITS", "{}")
+    assert importlib.reload(api.config).settings.RATE_LIMITS == {}
+    monkeypatch.delenv("RATE_LIMITS")
+    assert "POST /auth/login" in importlib.reload(api.config).settings.RATE_LIMITS